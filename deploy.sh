@@ -33,6 +33,10 @@ IMAGE_NAME="orca-dummy-agent"
 IMAGE_TAG="latest"
 FULL_IMAGE_NAME="${IMAGE_NAME}:${IMAGE_TAG}"
 
+# معماری Lambda: پیش‌فرض ARM64 (Graviton) - ارزان‌تر و سریع‌تر برای Python
+# For x86_64 run: LAMBDA_PLATFORM=linux/amd64 ./deploy.sh
+LAMBDA_PLATFORM="${LAMBDA_PLATFORM:-linux/arm64}"
+
 # بررسی وجود .env.lambda
 if [ ! -f ".env.lambda" ]; then
     echo -e "${YELLOW}⚠️  فایل .env.lambda پیدا نشد!${NC}"
@@ -48,8 +52,8 @@ if [ ! -f ".env.lambda" ]; then
 fi
 
 # مرحله 1: Build Docker image
-echo -e "${GREEN}📦 Building Docker image...${NC}"
-docker build -f Dockerfile.lambda -t "${FULL_IMAGE_NAME}" .
+echo -e "${GREEN}📦 Building Docker image (${LAMBDA_PLATFORM})...${NC}"
+docker build --platform "${LAMBDA_PLATFORM}" -f Dockerfile.lambda -t "${FULL_IMAGE_NAME}" .
 
 if [ $? -ne 0 ]; then
     echo -e "${RED}❌ Build failed!${NC}"
@@ -80,5 +84,6 @@ echo ""
 echo -e "${YELLOW}💡 Tips:${NC}"
 echo "  - View logs: orca lambda logs ${IMAGE_NAME} --tail"
 echo "  - Test function: curl -XPOST <function-url> ..."
+echo "  - Function architecture must match the image (${LAMBDA_PLATFORM#linux/})"
 echo "  - See LAMBDA_DEPLOY.md for more details"
 
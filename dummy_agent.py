@@ -23,8 +23,14 @@ This dummy agent demonstrates ALL features available in orca-pip:
 """
 
 import asyncio
+import atexit
+import functools
+import itertools
 import logging
+import logging.handlers
 import os
+import queue
+import random
 import time
 from typing import Optional
 from pathlib import Path
@@ -88,31 +94,205 @@ from orca.config import LoadingKind, ButtonColor, TokenType
 # Lambda adapter
 from orca import LambdaAdapter, create_lambda_handler
 
-# Setup logging
-# In Lambda, /var/task is read-only, so use /tmp for log files
-is_lambda = os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
-log_file_path = "/tmp/dummy_agent.log" if is_lambda else "dummy_agent.log"
+# Enum values resolved once (examples use these on every request)
+_LK_ANALYZING = LoadingKind.ANALYZING.value
+_LK_CARD = LoadingKind.CARD.value
+_LK_CODING = LoadingKind.CODING.value
+_LK_GENERAL = LoadingKind.GENERAL.value
+_LK_GENERATING = LoadingKind.GENERATING.value
+_LK_IMAGE = LoadingKind.IMAGE.value
+_LK_MAP = LoadingKind.MAP.value
+_LK_SEARCHING = LoadingKind.SEARCHING.value
+_LK_THINKING = LoadingKind.THINKING.value
+_LK_VIDEO = LoadingKind.VIDEO.value
+_BC_INFO = ButtonColor.INFO.value
+_BC_PRIMARY = ButtonColor.PRIMARY.value
+_BC_SECONDARY = ButtonColor.SECONDARY.value
+_BC_SUCCESS = ButtonColor.SUCCESS.value
+_TT_COMPLETION = TokenType.COMPLETION.value
+_TT_PROMPT = TokenType.PROMPT.value
 
-setup_logging(
-    level=logging.INFO,
-    log_file=log_file_path,
-    enable_colors=not is_lambda  # Disable colors in Lambda (CloudWatch doesn't support them)
+# Demo payloads, built once and shared by every request (the SDK only reads them)
+_DEMO_CARDS = (
+    {
+        "photo": "https://via.placeholder.com/300x200.png?text=Card+1",
+        "header": "Card Title 1",
+        "subheader": "Card description 1",
+        "text": "Additional content for card 1"
+    },
+    {
+        "photo": "https://via.placeholder.com/300x200.png?text=Card+2",
+        "header": "Card Title 2",
+        "subheader": "Card description 2",
+        "text": "Additional content for card 2"
+    },
 )
+_DEMO_TRACKS = (
+    {
+        "label": "Track 1",
+        "url": "https://example.com/audio1.mp3",
+        "type": "audio/mp3"
+    },
+    {
+        "label": "Track 2",
+        "url": "https://example.com/audio2.mp3",
+        "type": "audio/mp3"
+    },
+)
+_SUMMARY_CARDS = (
+    {
+        "photo": "https://via.placeholder.com/300x200.png?text=Card+1",
+        "header": "Demo Card",
+        "subheader": "Card description",
+        "text": "Additional content"
+    },
+)
+_SUMMARY_TRACKS = (
+    {
+        "label": "Demo Track",
+        "url": "https://example.com/audio.mp3",
+        "type": "audio/mp3"
+    },
+)
+
 logger = get_logger(__name__)
 
 
+@functools.cache
+def _detect_lambda() -> bool:
+    """Check once whether we are running inside AWS Lambda."""
+    return os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+
+
+@functools.cache
+def _init_logging():
+    """
+    Setup logging on first use instead of at import time.
+    
+    Cached, so warm containers and additional agents skip the handler setup.
+    If the host app (e.g. main.py) already configured the "orca" logger, its
+    configuration is kept, as it was when this ran at import time before it.
+    """
+    if logging.getLogger("orca").handlers:
+        return logger
+    
+    is_lambda = _detect_lambda()
+    # In Lambda, only stdout reaches CloudWatch, so skip the log file there
+    log_file_path = None if is_lambda else "dummy_agent.log"
+    
+    setup_logging(
+        level=logging.INFO,
+        log_file=log_file_path,
+        enable_colors=not is_lambda  # Disable colors in Lambda (CloudWatch doesn't support them)
+    )
+    
+    # Move file writes to a background thread: log calls only enqueue records
+    orca_logger = logging.getLogger("orca")
+    file_handlers = [h for h in orca_logger.handlers if isinstance(h, logging.FileHandler)]
+    if file_handlers:
+        log_queue = queue.SimpleQueue()
+        for handler in file_handlers:
+            orca_logger.removeHandler(handler)
+        orca_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # Flush pending records on shutdown
+    
+    return logger
+
+
 # ============================================================================
 # 1. DECORATORS DEMONSTRATION
 # ============================================================================
 
+@functools.lru_cache(maxsize=256)
+def _cached_api_call(url: str) -> dict:
+    """Simulated API request, memoized per URL (callers get copies via external_api_call)."""
+    logger.info("Calling API: %s", url)
+    # Simulate API call
+    return {"status": "success", "data": "API response"}
+
+
+def sampled_measure_time(rate: float = 0.01):
+    """
+    Sampling variant of orca's measure_time.
+    
+    Times and logs only one call in every 1/rate, so most calls skip the
+    timer bookends and the log record while the sampled timings still
+    reflect the steady state.
+    """
+    every = max(1, round(1 / rate))
+    
+    def decorator(func):
+        calls = itertools.count()
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if next(calls) % every:
+                return func(*args, **kwargs)
+            start_time = time.perf_counter()
+            result = func(*args, **kwargs)
+            logger.info("%s took %.3fs (sampled 1/%d)", func.__name__, time.perf_counter() - start_time, every)
+            return result
+        return wrapper
+    return decorator
+
+
 @retry(max_attempts=3, delay=1.0, backoff=2.0)
 @log_execution(level=logging.INFO, include_args=True, include_result=True)
-@measure_time
+@sampled_measure_time(0.01)
 def external_api_call(url: str) -> dict:
-    """Simulate external API call with retry and logging."""
-    logger.info(f"Calling API: {url}")
-    # Simulate API call
-    return {"status": "success", "data": "API response"}
+    """Simulate external API call with retry and logging (cached per URL)."""
+    # Copy, so a caller mutating its result cannot change the cached response
+    return dict(_cached_api_call(url))
+
+
+# Drop cached responses (e.g. when upstream data is known to be stale)
+external_api_call.cache_clear = _cached_api_call.cache_clear
+
+
+def async_retry(
+    max_attempts: int = 3,
+    delay: float = 1.0,
+    backoff: float = 2.0,
+    exceptions: tuple = (Exception,),
+    max_delay: float = 30.0
+):
+    """
+    Async counterpart of orca's retry decorator for coroutines.
+    
+    Waits between attempts with asyncio.sleep, so the event loop keeps
+    serving other sessions during the backoff instead of blocking on time.sleep.
+    Each wait is drawn uniformly below the exponential backoff (full jitter),
+    so concurrent invocations don't retry in lockstep.
+    """
+    # Backoff ceilings are fixed per decoration; only the jitter is per call
+    delay_caps = tuple(min(max_delay, delay * backoff ** attempt) for attempt in range(max_attempts))
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt == max_attempts - 1:
+                        logger.error("Function %s failed after %d attempts: %s", func.__name__, max_attempts, e)
+                        raise
+                    current_delay = random.uniform(0, delay_caps[attempt])
+                    logger.warning(
+                        "Function %s failed (attempt %d/%d), retrying in %.3fs: %s",
+                        func.__name__, attempt + 1, max_attempts, current_delay, e
+                    )
+                    await asyncio.sleep(current_delay)
+        return wrapper
+    return decorator
+
+
+@async_retry(max_attempts=3, delay=1.0, backoff=2.0)
+async def external_api_call_async(url: str) -> dict:
+    """Async external API call; retries without blocking the event loop."""
+    return dict(_cached_api_call(url))
 
 
 @handle_errors(default_return=None, exception_class=ValueError, log_level=logging.ERROR)
@@ -123,12 +303,26 @@ def risky_operation(value: int) -> Optional[int]:
     return value * 2
 
 
-@deprecated("Use new_function() instead")
+def risky_operation_batch(values) -> list:
+    """
+    Batch variant of risky_operation for validation loops.
+    
+    Runs in a single comprehension instead of one decorated call per value;
+    negative values map to None, like the scalar version's default return.
+    """
+    return [value * 2 if value >= 0 else None for value in values]
+
+
 def old_function():
     """Deprecated function."""
     return "old result"
 
 
+# Only warn in debug builds; `python -O` skips the wrapper entirely
+if __debug__:
+    old_function = deprecated("Use new_function() instead")(old_function)
+
+
 # ============================================================================
 # 2. MIDDLEWARE DEMONSTRATION
 # ============================================================================
@@ -136,13 +330,23 @@ def old_function():
 class CustomAuthMiddleware(Middleware):
     """Custom authentication middleware."""
     
+    _AUTH_CONTEXT = {"authenticated": True, "user_id": "dummy-user"}
+    _AUTH_LOG = f"Auth context: {_AUTH_CONTEXT}"
+    
+    def __init__(self):
+        # Request types already seen to carry a 'message' field
+        self._message_types = set()
+    
     def process_request(self, data):
         """Process authentication info (log only, don't modify Pydantic model)."""
         logger.info("Authenticating request...")
-        if hasattr(data, 'message'):
-            # Log auth context (can't modify Pydantic model directly)
-            auth_context = {"authenticated": True, "user_id": "dummy-user"}
-            logger.info(f"Auth context: {auth_context}")
+        data_type = type(data)
+        if data_type not in self._message_types:
+            if not hasattr(data, 'message'):
+                return data
+            self._message_types.add(data_type)
+        # Log auth context (can't modify Pydantic model directly)
+        logger.info(self._AUTH_LOG)
         return data
     
     def process_response(self, response, request_data):
@@ -152,6 +356,79 @@ class CustomAuthMiddleware(Middleware):
         return response
 
 
+def fuse_middleware(middlewares):
+    """
+    Fuse a fixed list of middleware into a single coroutine function.
+    
+    Behaves like MiddlewareManager.execute(handler, data) for an async handler,
+    but the request and response hooks are bound once up front instead of
+    walked per request.
+    """
+    request_hooks = tuple((m, m.process_request) for m in middlewares)
+    response_hooks = tuple((m, m.process_response) for m in reversed(middlewares))
+    
+    async def run(handler, data):
+        for middleware, hook in request_hooks:
+            try:
+                data = hook(data)
+            except Exception as e:
+                logger.error("Error in middleware %s: %s", type(middleware).__name__, e)
+                middleware.process_error(e, data)
+                raise
+        response = await handler(data)
+        for middleware, hook in response_hooks:
+            try:
+                response = hook(response, data)
+            except Exception as e:
+                logger.error("Error in middleware %s: %s", type(middleware).__name__, e)
+                middleware.process_error(e, data)
+                raise
+        return response
+    
+    return run
+
+
+# ============================================================================
+# 2.5. STREAM BUFFERING
+# ============================================================================
+
+class StreamBuffer:
+    """
+    Coalesces consecutive stream chunks of one session into a single payload.
+    
+    Chunks are sent as one session.stream() call on flush() or once the
+    buffered text reaches max_size. Flush before any non-stream session call
+    (loading, buttons, media, close) to keep ordering intact.
+    """
+    
+    def __init__(self, session, max_size: int = 4096):
+        """
+        Initialize buffer for a session.
+        
+        Args:
+            session: Session object to stream to
+            max_size: Buffered characters that trigger an automatic flush (default: 4 KiB)
+        """
+        self.session = session
+        self.max_size = max_size
+        self._chunks = []
+        self._size = 0
+    
+    def write(self, content: str):
+        """Buffer a chunk, flushing if the size threshold is reached."""
+        self._chunks.append(content)
+        self._size += len(content)
+        if self._size >= self.max_size:
+            self.flush()
+    
+    def flush(self):
+        """Stream all buffered chunks as one payload."""
+        if self._chunks:
+            self.session.stream("".join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+
+
 # ============================================================================
 # 3. MAIN AGENT CLASS
 # ============================================================================
@@ -161,46 +438,91 @@ class DummyAgent:
     Comprehensive dummy agent demonstrating all orca-pip features.
     """
     
-    def __init__(self, dev_mode: bool = True, stream_delay: float = 0.3):
+    def __init__(self, dev_mode: bool = True, stream_delay: float = 0.3, fast_mode: bool = False):
         """
         Initialize agent with all features.
         
         Args:
             dev_mode: Enable dev mode
             stream_delay: Delay between streams in seconds (default: 0.3)
+            fast_mode: Skip all artificial pacing delays (only yield to the event loop)
         """
+        _init_logging()
+        
         # Use Builder pattern
         self.handler = (
             OrcaBuilder()
             .with_dev_mode(dev_mode)
             .build()
         )
+        # SessionBuilder holds per-session state, so one is still made per request
+        self._builder_factory = functools.partial(SessionBuilder, self.handler)
         
         # Setup middleware chain
         self.middleware_manager = MiddlewareManager()
         self.middleware_manager.use(LoggingMiddleware())
         self.middleware_manager.use(CustomAuthMiddleware())
+        # Requests run through a fused copy of the manager's chain
+        self._run_middleware = fuse_middleware(self.middleware_manager.chain.middlewares)
         
         # Stream delay configuration
         self.stream_delay = stream_delay
+        self.fast_mode = fast_mode
+        self.show_loading_pauses = dev_mode  # Hold loading indicators on screen only for demos
+        
+        # Storage credentials (the client itself is created on first use)
+        self.dev_mode = dev_mode
+        self._storage_env = (
+            os.getenv('ORCA_WORKSPACE'),
+            os.getenv('ORCA_TOKEN'),
+            os.getenv('STORAGE_URL', 'http://localhost:8000/api/v1/storage'),
+        )
         
-        # Initialize storage (if credentials available)
-        self.storage = None
+        # Retrying the whole comprehensive pipeline is a dev convenience only
+        if dev_mode:
+            self.comprehensive_example = async_retry(max_attempts=2)(self.comprehensive_example)
+        
+        # Bind the example dispatch table once (after any per-instance wrapping above)
+        self._dispatch = {
+            example_type: getattr(self, method_name)
+            for example_type, method_name in self._EXAMPLE_METHODS.items()
+        }
+        
+        logger.info("DummyAgent initialized with all features")
+    
+    @functools.cached_property
+    def storage(self):
+        """OrcaStorage client, created on first access (None if credentials are missing)."""
+        workspace, token, base_url = self._storage_env
+        if not (workspace and token):
+            return None
         try:
-            import os
-            if os.getenv('ORCA_WORKSPACE') and os.getenv('ORCA_TOKEN'):
-                self.storage = OrcaStorage(
-                    workspace=os.getenv('ORCA_WORKSPACE'),
-                    token=os.getenv('ORCA_TOKEN'),
-                    base_url=os.getenv('STORAGE_URL', 'http://localhost:8000/api/v1/storage'),
-                    mode='dev' if dev_mode else 'prod'
-                )
+            return OrcaStorage(
+                workspace=workspace,
+                token=token,
+                base_url=base_url,
+                mode='dev' if self.dev_mode else 'prod'
+            )
         except Exception as e:
-            logger.warning(f"Storage not available: {e}")
+            logger.warning("Storage not available: %s", e)
+            return None
+    
+    def warm_up(self):
+        """Create the lazily-built clients now (e.g. during the Lambda init phase)."""
+        _ = self.storage  # First access builds and caches the client
+    
+    async def _pause(self, delay: float = None):
+        """
+        Pause between chunks without blocking the event loop.
         
-        logger.info("DummyAgent initialized with all features")
+        Args:
+            delay: Delay in seconds (uses self.stream_delay if None, 0 in fast_mode)
+        """
+        if self.fast_mode:
+            delay = 0
+        await asyncio.sleep(delay if delay is not None else self.stream_delay)
     
-    def _stream_with_delay(self, session, content: str, delay: float = None):
+    async def _stream_with_delay(self, session, content: str, delay: float = None):
         """
         Stream content with delay.
         
@@ -210,9 +532,20 @@ class DummyAgent:
             delay: Delay in seconds (uses self.stream_delay if None)
         """
         session.stream(content)
-        time.sleep(delay if delay is not None else self.stream_delay)
+        await self._pause(delay)
+    
+    async def _flush_with_delay(self, buffer: StreamBuffer, delay: float = None):
+        """
+        Flush buffered chunks as one stream call, then delay.
+        
+        Args:
+            buffer: StreamBuffer holding the chunks
+            delay: Delay in seconds (uses self.stream_delay if None)
+        """
+        buffer.flush()
+        await self._pause(delay)
     
-    def _add_stream_with_delay(self, builder, content: str, delay: float = None):
+    async def _add_stream_with_delay(self, builder, content: str, delay: float = None):
         """
         Add stream to SessionBuilder with delay.
         
@@ -222,10 +555,32 @@ class DummyAgent:
             delay: Delay in seconds (uses self.stream_delay if None)
         """
         builder.add_stream(content)
-        time.sleep(delay if delay is not None else self.stream_delay)
+        await self._pause(delay)
         return builder
     
-    def _show_loading_with_delay(self, session, kind: str, duration: float = 1.5):
+    def _trace_batch(self, session, entries):
+        """
+        Send several trace entries back to back.
+        
+        Args:
+            session: Session object
+            entries: Iterable of (content, visibility) pairs
+        """
+        send = session.tracing.send
+        for content, visibility in entries:
+            send(content, visibility=visibility)
+    
+    async def _hold_loading(self, duration: float):
+        """
+        Keep a SessionBuilder loading indicator on screen for the frontend.
+        
+        Args:
+            duration: How long to show loading (skipped unless show_loading_pauses)
+        """
+        if self.show_loading_pauses:
+            await self._pause(duration)
+    
+    async def _show_loading_with_delay(self, session, kind: str, duration: float = 1.5):
         """
         Show loading indicator with delay for frontend visibility.
         
@@ -235,11 +590,15 @@ class DummyAgent:
             duration: How long to show loading (default: 1.5 seconds)
         """
         session.loading.start(kind)
-        time.sleep(duration)  # Give frontend time to show loading
+        if not self.show_loading_pauses:
+            # Nobody is watching the indicator; the frontend sees the transition on the next flush
+            session.loading.end(kind)
+            return
+        await self._pause(duration)  # Give frontend time to show loading
         session.loading.end(kind)
-        time.sleep(self.stream_delay)  # Small delay after hiding
+        await self._pause()  # Small delay after hiding
     
-    def _close_session_with_delay(self, session, final_delay: float = 0.5):
+    async def _close_session_with_delay(self, session, final_delay: float = 0.5):
         """
         Close session with a delay to ensure all chunks are sent incrementally.
         
@@ -250,14 +609,14 @@ class DummyAgent:
         Returns:
             Full response content as string
         """
-        time.sleep(final_delay)  # Ensure all previous chunks are sent incrementally
+        await self._pause(final_delay)  # Ensure all previous chunks are sent incrementally
         return session.close()
     
     # ========================================================================
     # 4. BASIC SESSION MANAGEMENT
     # ========================================================================
     
-    def basic_session_example(self, data: ChatMessage):
+    async def basic_session_example(self, data: ChatMessage):
         """Basic session management example with proper delays."""
         logger.info("=== Basic Session Example ===")
         
@@ -265,365 +624,346 @@ class DummyAgent:
         session = self.handler.begin(data)
         
         # Show loading first
-        self._show_loading_with_delay(session, LoadingKind.THINKING.value, duration=1.0)
+        await self._show_loading_with_delay(session, _LK_THINKING, duration=1.0)
         
-        # Stream content with delay
-        self._stream_with_delay(session, "Hello! ")
-        self._stream_with_delay(session, "This is a basic example.")
+        # Stream content as one coalesced chunk
+        buffer = StreamBuffer(session)
+        buffer.write("Hello! ")
+        buffer.write("This is a basic example.")
+        await self._flush_with_delay(buffer)
         
         # Close session with delay to ensure incremental sending
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 5. LOADING INDICATORS
     # ========================================================================
     
-    def loading_indicators_example(self, data: ChatMessage):
+    async def loading_indicators_example(self, data: ChatMessage):
         """Demonstrate all loading indicators with proper delays."""
         logger.info("=== Loading Indicators Example ===")
         
         session = self.handler.begin(data)
+        stream = self._stream_with_delay
         
         # Different loading states with delays for frontend visibility
-        self._show_loading_with_delay(session, LoadingKind.THINKING.value, duration=1.5)
-        self._stream_with_delay(session, "🤔 Thinking completed!\n\n")
+        await self._show_loading_with_delay(session, _LK_THINKING, duration=1.5)
+        await stream(session, "🤔 Thinking completed!\n\n")
         
-        self._show_loading_with_delay(session, LoadingKind.ANALYZING.value, duration=1.5)
-        self._stream_with_delay(session, "📊 Analysis completed!\n\n")
+        await self._show_loading_with_delay(session, _LK_ANALYZING, duration=1.5)
+        await stream(session, "📊 Analysis completed!\n\n")
         
-        self._show_loading_with_delay(session, LoadingKind.GENERATING.value, duration=1.5)
-        self._stream_with_delay(session, "✨ Generation completed!\n\n")
+        await self._show_loading_with_delay(session, _LK_GENERATING, duration=1.5)
+        await stream(session, "✨ Generation completed!\n\n")
         
-        self._show_loading_with_delay(session, LoadingKind.GENERAL.value, duration=1.5)
-        self._stream_with_delay(session, "⏳ Processing completed!\n\n")
+        await self._show_loading_with_delay(session, _LK_GENERAL, duration=1.5)
+        await stream(session, "⏳ Processing completed!\n\n")
         
         # Test other loading kinds
-        self._show_loading_with_delay(session, LoadingKind.SEARCHING.value, duration=1.5)
-        self._stream_with_delay(session, "🔍 Search completed!\n\n")
+        await self._show_loading_with_delay(session, _LK_SEARCHING, duration=1.5)
+        await stream(session, "🔍 Search completed!\n\n")
         
-        self._show_loading_with_delay(session, LoadingKind.CODING.value, duration=1.5)
-        self._stream_with_delay(session, "💻 Code generation completed!\n")
+        await self._show_loading_with_delay(session, _LK_CODING, duration=1.5)
+        await stream(session, "💻 Code generation completed!\n")
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 6. BUTTONS
     # ========================================================================
     
-    def buttons_example(self, data: ChatMessage):
+    async def buttons_example(self, data: ChatMessage):
         """Demonstrate button features with proper delays."""
         logger.info("=== Buttons Example ===")
         
         session = self.handler.begin(data)
-        self._stream_with_delay(session, "Here are some options:\n\n")
-        time.sleep(self.stream_delay)
+        await self._stream_with_delay(session, "Here are some options:\n\n")
+        await self._pause()
         
         # Link buttons
         session.button.link(
             "Visit Documentation",
             "https://docs.example.com",
-            color=ButtonColor.PRIMARY.value
+            color=_BC_PRIMARY
         )
-        time.sleep(self.stream_delay)
+        await self._pause()
         
         session.button.link(
             "GitHub Repository",
             "https://github.com/example/repo",
-            color=ButtonColor.SUCCESS.value
+            color=_BC_SUCCESS
         )
-        time.sleep(self.stream_delay)
+        await self._pause()
         
         # Action buttons
         session.button.action(
             "Regenerate Response",
             "regenerate",
-            color=ButtonColor.SECONDARY.value
+            color=_BC_SECONDARY
         )
-        time.sleep(self.stream_delay)
+        await self._pause()
         
         session.button.action(
             "Save to Favorites",
             "save_favorite",
-            color=ButtonColor.INFO.value
+            color=_BC_INFO
         )
-        time.sleep(self.stream_delay)
+        await self._pause()
         
         # Button groups
-        session.button.begin(default_color=ButtonColor.PRIMARY.value)
+        session.button.begin(default_color=_BC_PRIMARY)
         session.button.add_link("Option 1", "https://option1.com")
-        time.sleep(self.stream_delay)
+        await self._pause()
         session.button.add_link("Option 2", "https://option2.com")
-        time.sleep(self.stream_delay)
+        await self._pause()
         session.button.add_action("Action 1", "action1")
-        time.sleep(self.stream_delay)
+        await self._pause()
         session.button.end()
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 6.5. MEDIA OPERATIONS (Image, Video, Location, Card, Audio)
     # ========================================================================
     
-    def media_operations_example(self, data: ChatMessage):
+    async def media_operations_example(self, data: ChatMessage):
         """Demonstrate all media operations: image, video, location, card, audio."""
         logger.info("=== Media Operations Example ===")
         
         session = self.handler.begin(data)
+        stream = self._stream_with_delay
         
         # Image operations with loading
-        self._stream_with_delay(session, "=== Image Operations ===\n")
-        self._show_loading_with_delay(session, LoadingKind.IMAGE.value, duration=1.2)
+        await stream(session, "=== Image Operations ===\n")
+        await self._show_loading_with_delay(session, _LK_IMAGE, duration=1.2)
         session.image.send("https://via.placeholder.com/400x300.png?text=Orca+Test+Image")
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, "✓ Image sent\n\n")
+        await self._pause()
         
         # Video operations with loading
-        self._stream_with_delay(session, "=== Video Operations ===\n")
-        self._show_loading_with_delay(session, LoadingKind.VIDEO.value, duration=1.2)
+        await stream(session, "✓ Image sent\n\n=== Video Operations ===\n")
+        await self._show_loading_with_delay(session, _LK_VIDEO, duration=1.2)
         session.video.send("https://example.com/video.mp4")
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, "✓ Video URL sent\n")
+        await self._pause()
+        await stream(session, "✓ Video URL sent\n")
         
-        self._show_loading_with_delay(session, LoadingKind.VIDEO.value, duration=1.2)
+        await self._show_loading_with_delay(session, _LK_VIDEO, duration=1.2)
         session.video.youtube("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, "✓ YouTube video sent\n\n")
+        await self._pause()
         
         # Location operations with loading
-        self._stream_with_delay(session, "=== Location Operations ===\n")
-        self._show_loading_with_delay(session, LoadingKind.MAP.value, duration=1.2)
+        await stream(session, "✓ YouTube video sent\n\n=== Location Operations ===\n")
+        await self._show_loading_with_delay(session, _LK_MAP, duration=1.2)
         session.location.send("35.6892, 51.3890")
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, "✓ Location sent (string)\n")
+        await self._pause()
+        await stream(session, "✓ Location sent (string)\n")
         
-        self._show_loading_with_delay(session, LoadingKind.MAP.value, duration=1.2)
+        await self._show_loading_with_delay(session, _LK_MAP, duration=1.2)
         session.location.send_coordinates(40.7128, -74.0060)
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, "✓ Location sent (coordinates)\n\n")
+        await self._pause()
         
         # Card list operations with loading
-        self._stream_with_delay(session, "=== Card List Operations ===\n")
-        cards = [
-            {
-                "photo": "https://via.placeholder.com/300x200.png?text=Card+1",
-                "header": "Card Title 1",
-                "subheader": "Card description 1",
-                "text": "Additional content for card 1"
-            },
-            {
-                "photo": "https://via.placeholder.com/300x200.png?text=Card+2",
-                "header": "Card Title 2",
-                "subheader": "Card description 2",
-                "text": "Additional content for card 2"
-            }
-        ]
-        self._show_loading_with_delay(session, LoadingKind.CARD.value, duration=1.2)
-        session.card.send(cards)
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, f"✓ {len(cards)} cards sent\n\n")
+        await stream(session, "✓ Location sent (coordinates)\n\n=== Card List Operations ===\n")
+        await self._show_loading_with_delay(session, _LK_CARD, duration=1.2)
+        session.card.send(_DEMO_CARDS)
+        await self._pause()
         
         # Audio operations
-        self._stream_with_delay(session, "=== Audio Operations ===\n")
-        tracks = [
-            {
-                "label": "Track 1",
-                "url": "https://example.com/audio1.mp3",
-                "type": "audio/mp3"
-            },
-            {
-                "label": "Track 2",
-                "url": "https://example.com/audio2.mp3",
-                "type": "audio/mp3"
-            }
-        ]
-        session.audio.send(tracks)
-        time.sleep(self.stream_delay)
-        self._stream_with_delay(session, f"✓ {len(tracks)} audio tracks sent\n")
-        
-        return self._close_session_with_delay(session)
+        await stream(session, f"✓ {len(_DEMO_CARDS)} cards sent\n\n=== Audio Operations ===\n")
+        session.audio.send(_DEMO_TRACKS)
+        await self._pause()
+        await stream(session, f"✓ {len(_DEMO_TRACKS)} audio tracks sent\n")
+        
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 7. VARIABLES AND MEMORY
     # ========================================================================
     
-    def variables_memory_example(self, data: ChatMessage):
+    async def variables_memory_example(self, data: ChatMessage):
         """Demonstrate Variables and MemoryHelper."""
         logger.info("=== Variables and Memory Example ===")
         
         session = self.handler.begin(data)
+        buffer = StreamBuffer(session)
         
         # Variables helper
-        vars = Variables(data.variables) if hasattr(data, 'variables') else Variables([])
+        vars = Variables(getattr(data, 'variables', []))
         
-        self._stream_with_delay(session, "=== Variables ===\n")
+        buffer.write("=== Variables ===\n")
         if vars.has("OPENAI_API_KEY"):
-            self._stream_with_delay(session, "✓ OpenAI API Key found\n")
+            buffer.write("✓ OpenAI API Key found\n")
             # Don't log the actual key
-            self._stream_with_delay(session, f"  Key length: {len(vars.get('OPENAI_API_KEY') or '')}\n")
+            buffer.write(f"  Key length: {len(vars.get('OPENAI_API_KEY') or '')}\n")
         else:
-            self._stream_with_delay(session, "✗ OpenAI API Key not found\n")
+            buffer.write("✗ OpenAI API Key not found\n")
         
         # List all variables
         all_vars = vars.list_names()
-        self._stream_with_delay(session, f"Total variables: {len(all_vars)}\n")
-        for var_name in all_vars[:5]:  # Show first 5
-            self._stream_with_delay(session, f"  - {var_name}\n")
+        buffer.write(f"Total variables: {len(all_vars)}\n")
+        for var_name in itertools.islice(all_vars, 5):  # Show first 5
+            buffer.write(f"  - {var_name}\n")
+        await self._flush_with_delay(buffer)
         
         # Memory helper
-        self._stream_with_delay(session, "\n=== Memory ===\n")
-        memory = MemoryHelper(data.memory) if hasattr(data, 'memory') else MemoryHelper({})
+        buffer.write("\n=== Memory ===\n")
+        memory = MemoryHelper(getattr(data, 'memory', {}))
         
         if memory.is_empty():
-            self._stream_with_delay(session, "No user memory available\n")
+            buffer.write("No user memory available\n")
         else:
             name = memory.get_name()
             if name:
-                self._stream_with_delay(session, f"User name: {name}\n")
+                buffer.write(f"User name: {name}\n")
             
             goals = memory.get_goals()
             if goals:
-                self._stream_with_delay(session, f"User goals: {', '.join(goals[:3])}\n")
+                buffer.write(f"User goals: {', '.join(goals[:3])}\n")
             
             location = memory.get_location()
             if location:
-                self._stream_with_delay(session, f"Location: {location}\n")
+                buffer.write(f"Location: {location}\n")
             
             interests = memory.get_interests()
             if interests:
-                self._stream_with_delay(session, f"Interests: {', '.join(interests[:3])}\n")
+                buffer.write(f"Interests: {', '.join(interests[:3])}\n")
+        await self._flush_with_delay(buffer)
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 8. USAGE TRACKING AND TRACING
     # ========================================================================
     
-    def usage_tracking_example(self, data: ChatMessage):
+    async def usage_tracking_example(self, data: ChatMessage):
         """Demonstrate usage tracking and tracing with proper delays."""
         logger.info("=== Usage Tracking and Tracing Example ===")
         
         session = self.handler.begin(data)
+        stream = self._stream_with_delay
         
         # Usage tracking
-        self._stream_with_delay(session, "Tracking token usage...\n\n")
-        time.sleep(self.stream_delay)
+        await stream(session, "Tracking token usage...\n\n")
+        await self._pause()
         
         session.usage.track(
             tokens=1500,
-            token_type=TokenType.PROMPT.value,
+            token_type=_TT_PROMPT,
             cost="0.03",
             label="Input tokens"
         )
-        time.sleep(self.stream_delay)
-        
         session.usage.track(
             tokens=2000,
-            token_type=TokenType.COMPLETION.value,
+            token_type=_TT_COMPLETION,
             cost="0.06",
             label="Output tokens"
         )
-        time.sleep(self.stream_delay)
+        await self._pause()
         
         # Tracing
-        self._stream_with_delay(session, "Tracing operations...\n\n")
-        time.sleep(self.stream_delay)
+        await stream(session, "Tracing operations...\n\n")
+        await self._pause()
         
-        session.tracing.send("Starting processing", visibility="all")
-        time.sleep(self.stream_delay * 2)
-        session.tracing.send("Step 1: Parsing input", visibility="dev")
-        time.sleep(self.stream_delay * 2)
-        session.tracing.send("Step 2: Validating data", visibility="dev")
-        time.sleep(self.stream_delay * 2)
-        session.tracing.send("Step 3: Generating response", visibility="all")
-        time.sleep(self.stream_delay * 2)
-        session.tracing.send("Processing complete", visibility="all")
-        time.sleep(self.stream_delay)
+        self._trace_batch(session, (
+            ("Starting processing", "all"),
+            ("Step 1: Parsing input", "dev"),
+            ("Step 2: Validating data", "dev"),
+            ("Step 3: Generating response", "all"),
+            ("Processing complete", "all"),
+        ))
+        await self._pause()
         
-        self._stream_with_delay(session, "✓ Usage and tracing completed\n")
+        await stream(session, "✓ Usage and tracing completed\n")
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 9. STORAGE SDK
     # ========================================================================
     
-    def storage_example(self, data: ChatMessage):
+    async def storage_example(self, data: ChatMessage):
         """Demonstrate Storage SDK features."""
         logger.info("=== Storage SDK Example ===")
         
         session = self.handler.begin(data)
+        stream = self._stream_with_delay
         
         if not self.storage:
-            self._stream_with_delay(session, "Storage SDK not configured (missing credentials)\n")
-            return self._close_session_with_delay(session)
+            await stream(session, "Storage SDK not configured (missing credentials)\n")
+            return await self._close_session_with_delay(session)
         
         try:
-            self._stream_with_delay(session, "=== Storage Operations ===\n\n")
-            
             # List buckets
-            self._stream_with_delay(session, "Listing buckets...\n")
-            try:
-                buckets = self.storage.list_buckets()
-                self._stream_with_delay(session, f"Found {len(buckets)} bucket(s)\n")
-                for bucket in buckets[:3]:  # Show first 3
-                    self._stream_with_delay(session, f"  - {bucket.get('name', 'N/A')}\n")
-            except Exception as e:
-                self._stream_with_delay(session, f"Error listing buckets: {str(e)}\n")
+            await stream(session, "=== Storage Operations ===\n\nListing buckets...\n")
             
-            # Upload example (if bucket exists)
-            self._stream_with_delay(session, "\nUpload example:\n")
-            try:
-                content = b"Hello from Dummy Agent!"
-                file_info = self.storage.upload_buffer(
+            # Listing and the upload example are independent blocking calls,
+            # so run both in worker threads at the same time
+            buckets, file_info = await asyncio.gather(
+                asyncio.to_thread(self.storage.list_buckets),
+                asyncio.to_thread(
+                    self.storage.upload_buffer,
                     bucket='demo-bucket',
                     file_name='dummy_test.txt',
-                    buffer=content,
+                    buffer=b"Hello from Dummy Agent!",
                     folder_path='dummy-agent/',
                     visibility='private',
                     generate_url=True
-                )
-                self._stream_with_delay(session, f"✓ Uploaded: {file_info.get('key', 'N/A')}\n")
-            except Exception as e:
-                self._stream_with_delay(session, f"Upload error (expected if bucket doesn't exist): {str(e)[:50]}\n")
+                ),
+                return_exceptions=True,
+            )
+            
+            if isinstance(buckets, Exception):
+                await stream(session, f"Error listing buckets: {type(buckets).__name__}\n")
+            else:
+                lines = [f"Found {len(buckets)} bucket(s)\n"]
+                lines.extend(f"  - {bucket.get('name', 'N/A')}\n" for bucket in itertools.islice(buckets, 3))  # Show first 3
+                await stream(session, "".join(lines))
+            
+            # Upload example (if bucket exists)
+            await stream(session, "\nUpload example:\n")
+            if isinstance(file_info, Exception):
+                await stream(session, f"Upload error (expected if bucket doesn't exist): {type(file_info).__name__}\n")
+            else:
+                await stream(session, f"✓ Uploaded: {file_info.get('key', 'N/A')}\n")
             
         except Exception as e:
             session.error("Storage operation failed", exception=e)
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 10. DESIGN PATTERNS
     # ========================================================================
     
-    def patterns_example(self, data: ChatMessage):
+    async def patterns_example(self, data: ChatMessage):
         """Demonstrate design patterns."""
         logger.info("=== Design Patterns Example ===")
         
         # SessionBuilder pattern
-        builder = SessionBuilder(self.handler)
+        builder = self._builder_factory()
         builder.start_session(data)
-        builder.show_loading(LoadingKind.THINKING.value)
-        self._add_stream_with_delay(builder, "Using SessionBuilder pattern...\n")
-        builder.hide_loading(LoadingKind.THINKING.value)
+        builder.show_loading(_LK_THINKING)
+        await self._add_stream_with_delay(builder, "Using SessionBuilder pattern...\n")
+        builder.hide_loading(_LK_THINKING)
         builder.add_button("Learn More", "https://example.com")
-        time.sleep(self.stream_delay)
+        await self._pause()
         result = builder.complete()
         
         # Context manager pattern
         with SessionContext(self.handler, data) as session:
-            self._stream_with_delay(session, "Using SessionContext for automatic cleanup...\n")
+            await self._stream_with_delay(session, "Using SessionContext for automatic cleanup...\n")
             session.button.link("Context Example", "https://example.com")
             # Session automatically closes on exit
         
-        # Timed operation
-        with timed_operation("pattern_demo"):
-            # Simulate some work
-            time.sleep(0.1)
-        
-        # Suppress exceptions
-        with suppress_exceptions(ValueError):
-            # This won't crash
-            value = int("not a number")  # Suppressed
+        # Timed operation / suppressed exception demos are for dev runs only
+        if self.dev_mode:
+            with timed_operation("pattern_demo"):
+                # Simulate some work
+                await self._pause(0.1)
+            
+            # Suppress exceptions
+            with suppress_exceptions(ValueError):
+                # This won't crash
+                value = int("not a number")  # Suppressed
         
         return result
     
@@ -631,209 +971,208 @@ class DummyAgent:
     # 11. MIDDLEWARE EXAMPLE
     # ========================================================================
     
-    def middleware_example(self, data: ChatMessage):
+    async def middleware_example(self, data: ChatMessage):
         """Demonstrate middleware pattern."""
         logger.info("=== Middleware Example ===")
         
-        def process_with_middleware(d):
-            """Process request through middleware."""
-            session = self.handler.begin(d)
-            self._stream_with_delay(session, "Request processed through middleware chain!\n")
-            self._stream_with_delay(session, "✓ Authentication checked\n")
-            self._stream_with_delay(session, "✓ Request logged\n")
-            self._stream_with_delay(session, "✓ Validation passed\n")
-            return self._close_session_with_delay(session)
-        
-        # Execute through middleware
-        result = self.middleware_manager.execute(process_with_middleware, data)
+        # Execute through the middleware pipeline built in __init__
+        result = await self._run_middleware(self._middleware_flow, data)
         return result
     
+    async def _middleware_flow(self, d: ChatMessage):
+        """Process request through middleware."""
+        session = self.handler.begin(d)
+        buffer = StreamBuffer(session)
+        buffer.write("Request processed through middleware chain!\n")
+        buffer.write("✓ Authentication checked\n")
+        buffer.write("✓ Request logged\n")
+        buffer.write("✓ Validation passed\n")
+        await self._flush_with_delay(buffer)
+        return await self._close_session_with_delay(session)
+    
     # ========================================================================
     # 12. ERROR HANDLING
     # ========================================================================
     
-    def error_handling_example(self, data: ChatMessage):
+    async def error_handling_example(self, data: ChatMessage):
         """Demonstrate comprehensive error handling."""
         logger.info("=== Error Handling Example ===")
         
         session = self.handler.begin(data)
+        buffer = StreamBuffer(session)
         
         # Custom exception
         try:
             raise ValidationError(
                 "This is a validation error",
-                error_code="VALIDATION_ERROR",
-                context={"field": "message", "value": "test"}
+                details={"error_code": "VALIDATION_ERROR", "field": "message", "value": "test"}
             )
         except ValidationError as e:
-            self._stream_with_delay(session, f"Caught ValidationError: {e.message}\n")
-            self._stream_with_delay(session, f"Error code: {e.error_code}\n")
-            error_dict = e.to_dict()
-            self._stream_with_delay(session, f"Error details: {error_dict}\n")
+            buffer.write(f"Caught ValidationError: {e.message}\n")
+            buffer.write(f"Error code: {e.details['error_code']}\n")
+            buffer.write(f"Error details: {e.details}\n")
+            await self._flush_with_delay(buffer)
         
         # Stream error
         try:
-            raise StreamError(
-                "Stream operation failed",
-                error_code="STREAM_FAILED",
-                context={"channel": "test-channel"}
-            )
+            raise StreamError("Stream operation failed", channel="test-channel")
         except StreamError as e:
             session.error("Stream error occurred", exception=e)
         
-        return self._close_session_with_delay(session)
+        return await self._close_session_with_delay(session)
     
     # ========================================================================
     # 13. COMPREHENSIVE EXAMPLE (ALL FEATURES)
     # ========================================================================
     
-    @retry(max_attempts=2)
-    @log_execution(level=logging.INFO, include_args=True)
-    @measure_time
-    def comprehensive_example(self, data: ChatMessage):
+    async def comprehensive_example(self, data: ChatMessage):
         """Comprehensive example using ALL features with proper delays and loading indicators."""
         logger.info("=== COMPREHENSIVE EXAMPLE (ALL FEATURES) ===")
         
-        # Use middleware
-        def process_comprehensive(d):
-            # Use SessionBuilder with delays
-            builder = SessionBuilder(self.handler).start_session(d)
-            
-            # ========== 1. Initial Thinking Loading ==========
-            builder.show_loading(LoadingKind.THINKING.value)
-            builder.add_stream("🚀 Starting comprehensive demo...\n\n")
-            builder.hide_loading(LoadingKind.THINKING.value)
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # ========== 2. Variables and Memory ==========
-            builder.add_stream("📦 Variables and Memory:\n")
-            builder.process(lambda s: self._show_variables_memory(s, d))
-            builder.execute()
-            time.sleep(self.stream_delay * 2)
-            
-            # ========== 3. Usage Tracking with Loading ==========
-            builder.show_loading(LoadingKind.GENERAL.value)
-            builder.add_stream("\n📊 Usage Tracking:\n")
-            builder.track_usage(tokens=1500, token_type=TokenType.PROMPT.value, cost="0.03")
-            builder.track_usage(tokens=2000, token_type=TokenType.COMPLETION.value, cost="0.06")
-            builder.hide_loading(LoadingKind.GENERAL.value)
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # ========== 4. Tracing ==========
-            builder.add_stream("\n🔍 Tracing:\n")
-            builder.track_trace("Operation started", "all")
-            builder.execute()
-            time.sleep(self.stream_delay * 2)
-            builder.track_trace("Processing data", "dev")
-            builder.execute()
-            time.sleep(self.stream_delay * 2)
-            builder.track_trace("Operation completed", "all")
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # ========== 5. Buttons ==========
-            builder.add_stream("\n🔘 Buttons:\n")
-            builder.add_button("Documentation", "https://docs.example.com")
-            builder.add_button("GitHub", "https://github.com/example")
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # ========== 6. Media Operations with Loading Indicators ==========
-            builder.add_stream("\n🖼️ Media Operations:\n")
-            
-            # Image with loading
-            builder.show_loading(LoadingKind.IMAGE.value)
-            builder.execute()
-            time.sleep(0.5)  # Show loading for frontend
-            builder.hide_loading(LoadingKind.IMAGE.value)
-            builder.add_image("https://via.placeholder.com/400x300.png?text=Orca+Demo")
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # Video with loading
-            builder.show_loading(LoadingKind.VIDEO.value)
-            builder.execute()
-            time.sleep(0.5)  # Show loading for frontend
-            builder.hide_loading(LoadingKind.VIDEO.value)
-            builder.add_video("https://example.com/video.mp4")
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # YouTube with loading
-            builder.show_loading(LoadingKind.VIDEO.value)
-            builder.execute()
-            time.sleep(1.2)  # Show loading for frontend
-            builder.hide_loading(LoadingKind.VIDEO.value)
-            builder.add_youtube("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # Location with loading
-            builder.show_loading(LoadingKind.MAP.value)
-            builder.add_stream("Loading map...")
-            builder.execute()
-            time.sleep(0.5)  # Show loading for frontend
-            builder.hide_loading(LoadingKind.MAP.value)
-            builder.add_location_coordinates(35.6892, 51.3890)
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # Cards with loading
-            builder.show_loading(LoadingKind.CARD.value)
-            builder.execute()
-            time.sleep(0.5)  # Show loading for frontend
-            builder.hide_loading(LoadingKind.CARD.value)
-            builder.add_card_list([
-                {
-                    "photo": "https://via.placeholder.com/300x200.png?text=Card+1",
-                    "header": "Demo Card",
-                    "subheader": "Card description",
-                    "text": "Additional content"
-                }
-            ])
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # Audio
-            builder.add_audio([
-                {
-                    "label": "Demo Track",
-                    "url": "https://example.com/audio.mp3",
-                    "type": "audio/mp3"
-                }
-            ])
-            builder.execute()
-            time.sleep(self.stream_delay)
-            
-            # ========== 7. Complete ==========
-            time.sleep(0.5)  # Final delay before closing
-            result = builder.close()
-            
-            return result
+        # Execute through the middleware pipeline built in __init__
+        return await self._run_middleware(self._comprehensive_flow, data)
+    
+    async def _comprehensive_flow(self, d: ChatMessage):
+        """Session flow of comprehensive_example (runs inside the middleware pipeline)."""
+        # Use SessionBuilder with delays
+        builder = self._builder_factory().start_session(d)
+        
+        # ========== 1. Initial Thinking Loading ==========
+        builder.show_loading(_LK_THINKING)
+        builder.add_stream("🚀 Starting comprehensive demo...\n\n")
+        builder.hide_loading(_LK_THINKING)
+        builder.execute()
+        await self._pause()
+        
+        # ========== 2. Variables and Memory ==========
+        builder.add_stream("📦 Variables and Memory:\n")
+        builder.process(lambda s: self._show_variables_memory(s, d))
+        builder.execute()
+        await self._pause(self.stream_delay * 2)
+        
+        # ========== 3. Usage Tracking with Loading ==========
+        builder.show_loading(_LK_GENERAL)
+        builder.add_stream("\n📊 Usage Tracking:\n")
+        builder.track_usage(tokens=1500, token_type=_TT_PROMPT, cost="0.03")
+        builder.track_usage(tokens=2000, token_type=_TT_COMPLETION, cost="0.06")
+        builder.hide_loading(_LK_GENERAL)
+        builder.execute()
+        await self._pause()
+        
+        # ========== 4. Tracing ==========
+        builder.add_stream("\n🔍 Tracing:\n")
+        builder.track_trace("Operation started", "all")
+        builder.track_trace("Processing data", "dev")
+        builder.track_trace("Operation completed", "all")
+        builder.execute()
+        await self._pause()
+        
+        # ========== 5. Buttons ==========
+        builder.add_stream("\n🔘 Buttons:\n")
+        builder.add_button("Documentation", "https://docs.example.com")
+        builder.add_button("GitHub", "https://github.com/example")
+        builder.execute()
+        await self._pause()
+        
+        # ========== 6. Media Operations with Loading Indicators ==========
+        builder.add_stream("\n🖼️ Media Operations:\n")
+        
+        # Each stage's indicator must stay next to its own media, and the map
+        # stage streams text, so the stages run in order rather than overlapped.
+        # Image with loading
+        builder.show_loading(_LK_IMAGE)
+        builder.execute()
+        await self._hold_loading(0.5)
+        builder.hide_loading(_LK_IMAGE)
+        builder.add_image("https://via.placeholder.com/400x300.png?text=Orca+Demo")
+        builder.execute()
+        await self._pause()
+        
+        # Video with loading
+        builder.show_loading(_LK_VIDEO)
+        builder.execute()
+        await self._hold_loading(0.5)
+        builder.hide_loading(_LK_VIDEO)
+        builder.add_video("https://example.com/video.mp4")
+        builder.execute()
+        await self._pause()
+        
+        # YouTube with loading
+        builder.show_loading(_LK_VIDEO)
+        builder.execute()
+        await self._hold_loading(1.2)
+        builder.hide_loading(_LK_VIDEO)
+        builder.add_youtube("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        builder.execute()
+        await self._pause()
+        
+        # Location with loading
+        builder.show_loading(_LK_MAP)
+        builder.add_stream("Loading map...")
+        builder.execute()
+        await self._hold_loading(0.5)
+        builder.hide_loading(_LK_MAP)
+        builder.add_location_coordinates(35.6892, 51.3890)
+        builder.execute()
+        await self._pause()
+        
+        # Cards with loading
+        builder.show_loading(_LK_CARD)
+        builder.execute()
+        await self._hold_loading(0.5)
+        builder.hide_loading(_LK_CARD)
+        builder.add_card_list(_SUMMARY_CARDS)
+        builder.execute()
+        await self._pause()
+        
+        # Audio
+        builder.add_audio(_SUMMARY_TRACKS)
+        builder.execute()
+        await self._pause()
+        
+        # ========== 7. Complete ==========
+        await self._pause(0.5)  # Final delay before closing
+        result = builder.close()
         
-        # Execute through middleware
-        return self.middleware_manager.execute(process_comprehensive, data)
+        return result
     
     def _show_variables_memory(self, session, data: ChatMessage):
-        """Helper to show variables and memory."""
-        vars = Variables(data.variables) if hasattr(data, 'variables') else Variables([])
-        memory = MemoryHelper(data.memory) if hasattr(data, 'memory') else MemoryHelper({})
+        """Helper to show variables and memory (runs synchronously inside builder.execute())."""
+        names = Variables(getattr(data, 'variables', [])).list_names()
+        memory = MemoryHelper(getattr(data, 'memory', {}))
         
-        self._stream_with_delay(session, f"  Variables: {len(vars.list_names())} found\n")
-        if not memory.is_empty():
-            self._stream_with_delay(session, f"  Memory: User '{memory.get_name() or 'Unknown'}' has {len(memory.get_goals())} goals\n")
+        # Check is_empty() first so an empty memory never hits the getters
+        if memory.is_empty():
+            memory_line = "  Memory: Empty\n"
         else:
-            self._stream_with_delay(session, "  Memory: Empty\n")
+            goals = memory.get_goals()
+            memory_line = f"  Memory: User '{memory.get_name() or 'Unknown'}' has {len(goals)} goals\n"
+        session.stream(f"  Variables: {len(names)} found\n{memory_line}")
     
     # ========================================================================
     # 14. MAIN PROCESS METHOD
     # ========================================================================
     
-    def process(self, data: ChatMessage, example_type: str = "comprehensive"):
+    # example_type -> example method name, bound per instance in __init__
+    _EXAMPLE_METHODS = {
+        "basic": "basic_session_example",
+        "loading": "loading_indicators_example",
+        "buttons": "buttons_example",
+        "media": "media_operations_example",
+        "variables": "variables_memory_example",
+        "usage": "usage_tracking_example",
+        "storage": "storage_example",
+        "patterns": "patterns_example",
+        "middleware": "middleware_example",
+        "errors": "error_handling_example",
+        "comprehensive": "comprehensive_example",
+    }
+    
+    async def aprocess(self, data: ChatMessage, example_type: str = "comprehensive"):
         """
-        Main processing method.
+        Main processing method (async).
+        
+        Runs the selected example directly on the caller's event loop.
         
         Args:
             data: ChatMessage from Orca
@@ -853,65 +1192,70 @@ class DummyAgent:
         # Log stream_url and stream_token if present
         if hasattr(data, 'stream_url') and hasattr(data, 'stream_token'):
             if data.stream_url and data.stream_token:
-                logger.info(f"Stream URL and token found in request: URL={data.stream_url[:50]}...")
+                logger.info("Stream URL and token found in request: URL=%s...", data.stream_url[:50])
             else:
                 logger.warning("stream_url or stream_token is None/empty in request")
         else:
             logger.warning("stream_url or stream_token not found in ChatMessage")
         
-        examples = {
-            "basic": self.basic_session_example,
-            "loading": self.loading_indicators_example,
-            "buttons": self.buttons_example,
-            "media": self.media_operations_example,
-            "variables": self.variables_memory_example,
-            "usage": self.usage_tracking_example,
-            "storage": self.storage_example,
-            "patterns": self.patterns_example,
-            "middleware": self.middleware_example,
-            "errors": self.error_handling_example,
-            "comprehensive": self.comprehensive_example,
-        }
-        
-        example_func = examples.get(example_type, self.comprehensive_example)
+        example_func = self._dispatch.get(example_type) or self._dispatch["comprehensive"]
         
         try:
             with timed_operation(f"process_{example_type}"):
-                return example_func(data)
+                return await example_func(data)
         except OrcaException as e:
-            logger.error(f"Orca error: {e.to_dict()}")
+            logger.error("Orca error: %s", e.to_dict())
             raise
         except Exception as e:
-            logger.exception(f"Unexpected error: {e}")
+            logger.exception("Unexpected error: %s", e)
             raise
-
+    
+    def process(self, data: ChatMessage, example_type: str = "comprehensive"):
+        """
+        Main processing method (sync wrapper around aprocess()).
+        
+        Runs the example on its own event loop, so call it from a thread
+        without a running loop (e.g. the standalone main() or a worker thread).
+        
+        Args:
+            data: ChatMessage from Orca
+            example_type: Type of example to run (see aprocess())
+        """
+        return asyncio.run(self.aprocess(data, example_type))
 
 # ============================================================================
 # 16. STANDALONE USAGE
 # ============================================================================
 
+# Demo request used by main(), built and validated once
+DEMO_CHAT_MESSAGE = ChatMessage(
+    thread_id="dummy-thread-456",
+    model="gpt-4",
+    message="Show me all features!",
+    conversation_id=1,
+    response_uuid="dummy-uuid-123",
+    message_uuid="dummy-message-789",
+    channel="dummy-channel",
+    url="http://localhost:8000/api/v1/messages",
+    variables=[
+        {"name": "OPENAI_API_KEY", "value": "sk-test123"},
+        {"name": "DATABASE_URL", "value": "postgresql://localhost/db"}
+    ],
+    memory={
+        "name": "Test User",
+        "goals": ["Learn Python", "Build AI apps"],
+        "location": "San Francisco, CA",
+        "interests": ["AI", "Programming"],
+        "preferences": ["Detailed explanations"],
+        "past_experiences": ["Built a web scraper"]
+    },
+)
+
+
 def main():
     """Standalone usage example."""
-    # Create mock data
-    class MockData:
-        response_uuid = "dummy-uuid-123"
-        thread_id = "dummy-thread-456"
-        channel = "dummy-channel"
-        message = "Show me all features!"
-        variables = [
-            {"name": "OPENAI_API_KEY", "value": "sk-test123"},
-            {"name": "DATABASE_URL", "value": "postgresql://localhost/db"}
-        ]
-        memory = {
-            "name": "Test User",
-            "goals": ["Learn Python", "Build AI apps"],
-            "location": "San Francisco, CA",
-            "interests": ["AI", "Programming"],
-            "preferences": ["Detailed explanations"],
-            "past_experiences": ["Built a web scraper"]
-        }
-    
-    data = ChatMessage(**MockData().__dict__)
+    agent = DummyAgent(dev_mode=True)
+    data = DEMO_CHAT_MESSAGE
     
     # Run comprehensive example
     print("\n" + "="*60)
@@ -3,28 +3,48 @@ Lambda Handler - Entry Point
 =============================
 
 Simplified Lambda handler using orca-pip utilities.
-Supports all FastAPI routes via Mangum + SQS/cron via LambdaAdapter.
+Supports all FastAPI routes via Mangum, concurrent SQS batches, and cron via LambdaAdapter.
 
-Uses the same process_message and app from main.py for consistency.
+Uses the same agent, example selection and app from main.py for consistency.
 """
 
 import asyncio
 import logging
-from typing import Any, Dict
+import os
+from typing import Any, Dict, List
 
+import orjson
 from mangum import Mangum
 from orca import ChatMessage, LambdaAdapter
 
-from main import process_message, app
+from main import (
+    app,
+    agent,
+    orca,
+    HEALTH_BODY,
+    set_request_id,
+    use_json_logging,
+    _pick_example_type,
+    _report_error,
+)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logging.basicConfig(level=logging.INFO)
+# One JSON object per log line, tagged with the invocation's request id
+use_json_logging()
 
-# Ensure event loop exists for Lambda (Python 3.11 quirk)
+# Use uvloop for every loop created in this process (ships with uvicorn[standard]).
+# Mangum and LambdaAdapter each create the invocation loop themselves if none exists.
 try:
-    asyncio.get_event_loop()
-except RuntimeError:
-    asyncio.set_event_loop(asyncio.new_event_loop())
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Build lazily-created clients during the Lambda init phase instead of on the
+# first request (the agent and OrcaHandler themselves are created by main)
+agent.warm_up()
 
 # Mangum handler for FastAPI (handles all routes: /health, /docs, /api/v1/*, etc.)
 mangum_handler = Mangum(app, lifespan="off")
@@ -32,11 +52,68 @@ mangum_handler = Mangum(app, lifespan="off")
 # LambdaAdapter for SQS and cron events
 lambda_adapter = LambdaAdapter()
 
+# Max SQS records of one batch processed at the same time
+SQS_CONCURRENCY = int(os.getenv("SQS_CONCURRENCY", "10"))
+
+# Prebuilt health check responses, served without going through Mangum/ASGI
+_HEALTH_RESPONSES = {
+    path: {
+        "statusCode": 200,
+        "headers": {"content-type": "application/json"},
+        "body": body.decode(),
+        "isBase64Encoded": False,
+    }
+    for path, body in (
+        ("/health", HEALTH_BODY),
+        ("/api/v1/health", orjson.dumps({"status": "healthy", "service": app.title, "version": app.version})),
+    )
+}
+
 
 @lambda_adapter.message_handler
 async def lambda_process_message(data: ChatMessage):
-    """SQS message handler - uses same process_message from main.py."""
-    return await process_message(data)
+    """SQS message handler - runs the agent directly (same example selection as main.py)."""
+    try:
+        return await agent.aprocess(data, _pick_example_type(data.message))
+    except Exception as e:
+        logger.exception("Error processing SQS message")
+        await asyncio.to_thread(_report_error, orca.begin(data), e)
+        # Re-raise so the record is listed in batchItemFailures (retry / DLQ)
+        raise
+
+
+async def process_sqs_batch(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Process all records of an SQS batch concurrently.
+    
+    LambdaAdapter handles SQS records one after another and never reports
+    failures, so batches are handled here instead.
+    
+    The records share one event loop, so only the agent's pacing delays
+    overlap. The SDK's session I/O (stream/close) is synchronous and still
+    runs one call at a time on the loop.
+    
+    Args:
+        records: SQS records from the Lambda event
+    
+    Returns:
+        Partial batch response listing the records that failed
+        (requires ReportBatchItemFailures on the event source mapping)
+    """
+    semaphore = asyncio.Semaphore(SQS_CONCURRENCY)
+    
+    async def run(record):
+        async with semaphore:
+            await lambda_process_message(ChatMessage.model_validate_json(record["body"]))
+    
+    results = await asyncio.gather(*(run(record) for record in records), return_exceptions=True)
+    
+    failures = []
+    for record, result in zip(records, results):
+        if isinstance(result, Exception):
+            logger.error("[SQS] Message %s failed: %r", record.get("messageId"), result)
+            failures.append({"itemIdentifier": record["messageId"]})
+    return {"batchItemFailures": failures}
 
 
 @lambda_adapter.cron_handler
@@ -46,17 +123,38 @@ async def scheduled_task(event: Dict[str, Any]):
     return {"status": "success"}
 
 
+def _is_plain_get(event: Dict[str, Any]) -> bool:
+    """True for GET requests whose response may use a single-value headers map."""
+    request_context = event.get("requestContext") or {}
+    method = event.get("httpMethod") or request_context.get("http", {}).get("method")
+    if method != "GET":
+        return False
+    return not ("elb" in request_context and "multiValueHeaders" in event)
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda entry point.
     
-    Uses LambdaAdapter.handle() for SQS/cron (auto-detects event type).
+    Processes SQS batches concurrently (process_sqs_batch).
+    Uses LambdaAdapter.handle() for cron events.
     Uses Mangum for HTTP requests (all FastAPI routes available).
     """
+    set_request_id(getattr(context, "aws_request_id", None))
+    
     # SQS or Cron - use LambdaAdapter (auto-detects and handles)
-    if ("Records" in event and event.get("Records", [{}])[0].get("eventSource") == "aws:sqs") or \
-       event.get("source") == "aws.events":
+    records = event.get("Records")
+    if records and records[0].get("eventSource") == "aws:sqs":
+        return asyncio.run(process_sqs_batch(records))
+    if event.get("source") == "aws.events":
         return lambda_adapter.handle(event, context)
     
-    # HTTP - use Mangum (all FastAPI routes: /health, /docs, /api/v1/*, etc.)
+    # Health checks (API Gateway v2 uses rawPath; v1 and ALB use path). Only plain
+    # GETs are answered here; other methods and ALB multi-value-header events go
+    # through Mangum so they get the exact FastAPI response (405, header shape).
+    health = _HEALTH_RESPONSES.get(event.get("rawPath") or event.get("path"))
+    if health is not None and _is_plain_get(event):
+        return health
+    
+    # HTTP - use Mangum (all FastAPI routes: /docs, /api/v1/*, etc.)
     return mangum_handler(event, context)
@@ -8,11 +8,18 @@ Only API endpoints - no UI.
 """
 
 import asyncio
+import functools
 import logging
+import logging.handlers
 import os
-from typing import Optional
-
-from fastapi import FastAPI
+import re
+import sys
+from contextvars import ContextVar
+from typing import Final, Optional
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from orca import (
     ChatMessage,
     OrcaHandler,
@@ -28,14 +35,120 @@ from dummy_agent import DummyAgent
 setup_logging(level=logging.INFO, enable_colors=True)
 logger = get_logger(__name__)
 
+# Lambda request id of the invocation being handled (set by lambda_handler)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# The same id for process_message, which add_standard_endpoints runs on its own
+# thread (threads do not inherit request_id_var). Lambda handles one invocation
+# per execution environment at a time, so a module-level value is enough.
+_invocation_request_id: Optional[str] = None
+
+
+def set_request_id(request_id: Optional[str]):
+    """Tag this invocation's log records (and its worker threads') with request_id."""
+    global _invocation_request_id
+    _invocation_request_id = request_id
+    request_id_var.set(request_id)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON line (CloudWatch Logs Insights friendly)."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = request_id_var.get()
+        if request_id:
+            entry["request_id"] = request_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+def use_json_logging():
+    """
+    Switch the output handlers of the root and "orca" loggers to JSON lines.
+    
+    Root's handlers are formatted whatever their type (the Lambda runtime
+    installs its own, non-StreamHandler one). If root has handlers, "orca"
+    stops propagating to it, since it has its own console handler; this
+    applies to the whole process, so in a server run with LOG_FORMAT=json
+    "orca" records then reach only the "orca" handlers.
+    """
+    formatter = JsonFormatter()
+    root = logging.getLogger()
+    if root.handlers:
+        logging.getLogger("orca").propagate = False
+    for log in (root, logging.getLogger("orca")):
+        for handler in log.handlers:
+            # File output keeps its format (it sits behind a QueueHandler)
+            if not isinstance(handler, (logging.FileHandler, logging.handlers.QueueHandler)):
+                handler.setFormatter(formatter)
+
 # Determine dev mode from environment
-dev_mode = os.getenv("ORCA_DEV_MODE", "false").lower() == "true"
+DEV_MODE: Final[bool] = os.getenv("ORCA_DEV_MODE", "false").lower() == "true"
+
+
+@functools.lru_cache(maxsize=1)
+def get_orca() -> OrcaHandler:
+    """Process-wide OrcaHandler (reused across warm Lambda invocations)."""
+    return OrcaHandler(dev_mode=DEV_MODE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_agent() -> DummyAgent:
+    """Process-wide DummyAgent (reused across warm Lambda invocations)."""
+    return DummyAgent(dev_mode=DEV_MODE)
+
+
+# Initialize Orca handler and dummy agent once per process
+orca = get_orca()
+agent = get_agent()
+
+
+# Message keyword -> example type, in priority order (earlier entries win)
+_KEYWORD_MAP = (
+    ("basic", "basic"),
+    ("loading", "loading"),
+    ("button", "buttons"),
+    ("media", "media"),
+    ("image", "media"),
+    ("video", "media"),
+    ("variable", "variables"),
+    ("memory", "variables"),
+    ("usage", "usage"),
+    ("tracking", "usage"),
+    ("storage", "storage"),
+    ("pattern", "patterns"),
+    ("middleware", "middleware"),
+    ("error", "errors"),
+    ("all", "comprehensive"),
+    ("comprehensive", "comprehensive"),
+)
+_KEYWORD_RE = re.compile(
+    "|".join(f"(?P<g{i}>{re.escape(keyword)})" for i, (keyword, _) in enumerate(_KEYWORD_MAP)),
+    re.IGNORECASE,
+)
+
 
-# Initialize Orca handler
-orca = OrcaHandler(dev_mode=dev_mode)
+def _pick_example_type(message: Optional[str]) -> str:
+    """Pick the example to run from keywords in the message (default: comprehensive)."""
+    if not message:
+        return "comprehensive"
+    # One regex scan; the highest-priority keyword found wins, as in a keyword if/elif chain
+    best = min((int(m.lastgroup[1:]) for m in _KEYWORD_RE.finditer(message)), default=None)
+    return "comprehensive" if best is None else _KEYWORD_MAP[best][1]
 
-# Initialize dummy agent
-agent = DummyAgent(dev_mode=dev_mode)
+
+def _report_error(session, exception: Exception):
+    """Send the error to the client and close the session (blocking)."""
+    try:
+        session.error("An error occurred", exception=exception)
+    finally:
+        session.close()
 
 
 async def process_message(data: ChatMessage):
@@ -43,58 +156,26 @@ async def process_message(data: ChatMessage):
     Main message processing function.
     Uses the dummy agent to demonstrate all orca-pip features.
     """
-    logger.info(f"Processing message: {data.message[:50] if data.message else 'None'}...")
+    # Runs on add_standard_endpoints' worker thread: bind the invocation's request id here
+    request_id_var.set(_invocation_request_id)
+    logger.info("Processing message: %s...", data.message[:50] if data.message else 'None')
     
     # Get example type from message or use default
-    example_type = "comprehensive"
-    if data.message:
-        message_lower = data.message.lower()
-        if "basic" in message_lower:
-            example_type = "basic"
-        elif "loading" in message_lower:
-            example_type = "loading"
-        elif "button" in message_lower:
-                example_type = "buttons"
-        elif "media" in message_lower or "image" in message_lower or "video" in message_lower:
-                example_type = "media"
-        elif "variable" in message_lower or "memory" in message_lower:
-                example_type = "variables"
-        elif "usage" in message_lower or "tracking" in message_lower:
-            example_type = "usage"
-        elif "storage" in message_lower:
-            example_type = "storage"
-        elif "pattern" in message_lower:
-            example_type = "patterns"
-        elif "middleware" in message_lower:
-            example_type = "middleware"
-        elif "error" in message_lower:
-            example_type = "errors"
-        elif "all" in message_lower or "comprehensive" in message_lower:
-            example_type = "comprehensive"
+    example_type = _pick_example_type(data.message)
     
     try:
-        # Wait 0.5 seconds before starting response
-        await asyncio.sleep(0.5)
-        
         # Process with dummy agent
-        # agent.process() creates its own session and handles streaming internally
-        # Run in thread to avoid blocking event loop
-        result = await asyncio.to_thread(
-            agent.process,
-            data,
-            example_type
-        )
+        # agent.aprocess() creates its own session and handles streaming internally
+        result = await agent.aprocess(data, example_type)
         
-        logger.info(f"Message processed successfully with example_type: {example_type}")
+        logger.info("Message processed successfully with example_type: %s", example_type)
         
     except Exception as e:
         logger.exception("Error processing message")
         # Create a session for error handling if needed
         session = orca.begin(data)
-        try:
-            await asyncio.to_thread(session.error, "An error occurred", exception=e)
-        finally:
-            await asyncio.to_thread(session.close)
+        # error()/close() do blocking network I/O in production; run both in one thread hop
+        await asyncio.to_thread(_report_error, session, e)
 
 
 # Create FastAPI app
@@ -103,6 +184,9 @@ app = create_orca_app(
     version="1.0.0",
     description="Comprehensive dummy agent demonstrating all orca-pip features with real-time streaming",
 )
+# Serialize JSON responses with orjson (create_orca_app has no default_response_class
+# parameter; set it before any routes are added so they all pick it up)
+app.router.default_response_class = ORJSONResponse
 
 # Add standard endpoints
 add_standard_endpoints(
@@ -112,16 +196,24 @@ add_standard_endpoints(
     process_message_func=process_message,
 )
 
+# Structured logs on request (after the agent and app have installed their handlers)
+if os.getenv("LOG_FORMAT", "").lower() == "json":
+    use_json_logging()
+
+
+# Health payload never changes after startup, so serialize it once
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Orca Dummy Agent",
+    "version": "1.0.0",
+    "dev_mode": DEV_MODE
+})
+
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "Orca Dummy Agent",
-        "version": "1.0.0",
-        "dev_mode": dev_mode
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -130,24 +222,32 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", "80"))
     docs_base = f"http://localhost:{port}"
     
-    print("\n" + "="*70)
-    print("🚀 ORCA DUMMY AGENT - API BACKEND")
-    print("="*70)
-    print(f"\n📖 API Documentation: {docs_base}/docs")
-    print(f"🔍 Health Check: {docs_base}/api/v1/health")
-    print(f"💬 Chat Endpoint: {docs_base}/api/v1/send_message")
-    
-    if dev_mode:
-        print(f"📡 SSE Stream: {docs_base}/api/v1/stream/{{channel}}")
-        print(f"📊 Poll Stream: {docs_base}/api/v1/poll/{{channel}}")
-        print("\n🔧 DEV MODE ACTIVE - No Centrifugo required!")
+    if DEV_MODE:
+        mode_lines = [
+            f"📡 SSE Stream: {docs_base}/api/v1/stream/{{channel}}",
+            f"📊 Poll Stream: {docs_base}/api/v1/poll/{{channel}}",
+            "\n🔧 DEV MODE ACTIVE - No Centrifugo required!",
+        ]
     else:
-        print("\n🟢 PRODUCTION MODE - Centrifugo/WebSocket streaming")
+        mode_lines = ["\n🟢 PRODUCTION MODE - Centrifugo/WebSocket streaming"]
     
-    print("\n✨ Features:")
-    print("   ✅ Real-time streaming")
-    print("   ✅ All orca-pip features")
-    print("   ✅ API endpoints only (no UI)")
-    print("="*70 + "\n")
+    # Build the banner once and emit it with a single write
+    banner = "\n".join([
+        "\n" + "="*70,
+        "🚀 ORCA DUMMY AGENT - API BACKEND",
+        "="*70,
+        f"\n📖 API Documentation: {docs_base}/docs",
+        f"🔍 Health Check: {docs_base}/api/v1/health",
+        f"💬 Chat Endpoint: {docs_base}/api/v1/send_message",
+        *mode_lines,
+        "\n✨ Features:",
+        "   ✅ Real-time streaming",
+        "   ✅ All orca-pip features",
+        "   ✅ API endpoints only (no UI)",
+        "="*70 + "\n",
+    ])
+    sys.stdout.write(banner + "\n")
+    sys.stdout.flush()
     
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop + httptools ship with uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools")